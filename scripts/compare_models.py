@@ -1,88 +1,160 @@
 #!/usr/bin/env python3
+import argparse
+import heapq
 import json
+import mmap
+import os
 import sys
 from pathlib import Path
-from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+MMAP_MIN_BYTES = 4 * 1024 * 1024
+
+DEFAULT_DISAGREEMENT_LIMIT = 50
+
+_ROW_FMT = "%-20s  %-8s  %-8s  %-8s  %-12s  %-12s  %-12s"
+
+def _loads(data):
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(bytes(data))
+
+def _dumps(obj):
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
+
+def _load_results_file(results_file):
+    if orjson is None or results_file.stat().st_size <= MMAP_MIN_BYTES:
+        return _loads(results_file.read_bytes())
+
+    with open(results_file, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as view:
+            return _loads(view)
 
 def load_results(results_dir):
-    results_dir = Path(results_dir)
     model_results = {}
 
-    for model_dir in results_dir.iterdir():
-        if not model_dir.is_dir():
-            continue
+    results_files = []
+    with os.scandir(results_dir) as it:
+        for entry in it:
+            if not entry.is_dir():
+                continue
 
-        results_file = model_dir / "batch_results.json"
-        if not results_file.exists():
-            continue
+            results_file = Path(entry.path, "batch_results.json")
+            if results_file.exists():
+                results_files.append(results_file)
 
-        try:
-            data = json.loads(results_file.read_text())
+    if not results_files:
+        return model_results
+
+    with ThreadPoolExecutor(max_workers=min(32, len(results_files))) as executor:
+        futures = [(results_file, executor.submit(_load_results_file, results_file)) for results_file in results_files]
+
+        for results_file, future in futures:
+            error = future.exception()
+            if error is not None:
+                print(f"Warning: Failed to load {results_file}: {error}", file=sys.stderr)
+                continue
+
+            data = future.result()
+            model_name = results_file.parent.name
+
+            if not isinstance(data, (dict, list)):
+                print(f"Warning: Failed to load {results_file}: expected a JSON object or array", file=sys.stderr)
+                continue
 
             if "metadata" in data and "results" in data:
-                model_results[model_dir.name] = data
+                model_results[model_name] = data
             else:
-                model_results[model_dir.name] = {
-                    "metadata": {"model": model_dir.name},
+                model_results[model_name] = {
+                    "metadata": {"model": model_name},
                     "results": data
                 }
-        except Exception as e:
-            print(f"Warning: Failed to load {results_file}: {e}", file=sys.stderr)
 
     return model_results
 
-def print_summary_table(model_results):
-    print("\n" + "=" * 100)
-    print("MODEL COMPARISON SUMMARY")
-    print("=" * 100)
-    print()
-
-    headers = ["Model", "Total", "Passed", "Failed", "Pass Rate", "Avg Time", "Total Time"]
-    col_widths = [20, 8, 8, 8, 12, 12, 12]
+def _aggregate(model_results):
+    summary = {}
+    eval_outcomes = {}
 
-    header_row = "  ".join(h.ljust(w) for h, w in zip(headers, col_widths))
-    print(header_row)
-    print("-" * 100)
-
-    for model_name, data in sorted(model_results.items()):
+    for model_name, data in model_results.items():
         metadata = data.get("metadata", {})
         results = data.get("results", [])
 
+        passed = 0
+        failed = 0
+        for result in results:
+            outcome = result.get("passed")
+            if outcome is True:
+                passed += 1
+            elif outcome is False:
+                failed += 1
+
+            eval_name = result.get("eval") or result.get("test_id")
+            if eval_name:
+                outcomes = eval_outcomes.get(eval_name)
+                if outcomes is None:
+                    outcomes = eval_outcomes[sys.intern(eval_name)] = {}
+                outcomes[model_name] = outcome
+
         total = metadata.get("total_evals", len(results))
-        passed = metadata.get("passed", sum(1 for r in results if r.get("passed") is True))
-        failed = metadata.get("failed", sum(1 for r in results if r.get("passed") is False))
-        pass_rate = metadata.get("pass_rate", round(passed/total*100, 1) if total else 0)
-        avg_time = metadata.get("avg_duration_s", 0)
-        total_time = metadata.get("total_duration_s", 0)
+        passed = metadata.get("passed", passed)
 
-        row = [
-            model_name,
-            str(total),
-            str(passed),
-            str(failed),
-            f"{pass_rate:.1f}%",
-            f"{avg_time:.1f}s",
-            f"{total_time/60:.1f}m"
-        ]
+        summary[model_name] = {
+            "total_evals": total,
+            "passed": passed,
+            "failed": metadata.get("failed", failed),
+            "pass_rate": metadata.get("pass_rate", round(passed/total*100, 1) if total else 0),
+            "avg_duration_s": metadata.get("avg_duration_s", 0),
+            "total_duration_s": metadata.get("total_duration_s", 0),
+        }
+
+    return summary, eval_outcomes
 
-        row_str = "  ".join(v.ljust(w) for v, w in zip(row, col_widths))
-        print(row_str)
+def _disagrees(outcomes):
+    values = iter(outcomes.values())
+    first = next(values, None)
+    for value in values:
+        if value != first:
+            return True
+    return False
 
+def print_summary_table(summary):
+    print("\n" + "=" * 100)
+    print("MODEL COMPARISON SUMMARY")
+    print("=" * 100)
     print()
 
-def analyze_eval_disagreements(model_results):
-    eval_outcomes = defaultdict(dict)
+    print(_ROW_FMT % ("Model", "Total", "Passed", "Failed", "Pass Rate", "Avg Time", "Total Time"))
+    print("-" * 100)
 
-    for model_name, data in model_results.items():
-        results = data.get("results", [])
-        for result in results:
-            eval_name = result.get("eval") or result.get("test_id")
-            if eval_name:
-                eval_outcomes[eval_name][model_name] = result.get("passed")
+    for model_name, stats in sorted(summary.items()):
+        print(_ROW_FMT % (
+            model_name,
+            stats["total_evals"],
+            stats["passed"],
+            stats["failed"],
+            f"{stats['pass_rate']:.1f}%",
+            f"{stats['avg_duration_s']:.1f}s",
+            f"{stats['total_duration_s']/60:.1f}m"
+        ))
 
+    print()
+
+def analyze_eval_disagreements(eval_outcomes, limit=DEFAULT_DISAGREEMENT_LIMIT):
     disagreements = []
     for eval_name, outcomes in eval_outcomes.items():
-        if len(set(outcomes.values())) > 1:
+        if _disagrees(outcomes):
             disagreements.append((eval_name, outcomes))
 
     if disagreements:
@@ -91,72 +163,75 @@ def analyze_eval_disagreements(model_results):
         print("=" * 100)
         print()
 
-        for eval_name, outcomes in sorted(disagreements):
+        if limit > 0:
+            shown = heapq.nsmallest(limit, disagreements, key=itemgetter(0))
+        else:
+            shown = sorted(disagreements, key=itemgetter(0))
+
+        for eval_name, outcomes in shown:
             print(f"  {eval_name}")
             for model_name, passed in sorted(outcomes.items()):
                 status = "✓ PASSED" if passed else ("✗ FAILED" if passed is False else "? NULL")
                 print(f"    {model_name}: {status}")
             print()
+
+        hidden = len(disagreements) - len(shown)
+        if hidden:
+            print(f"  ... and {hidden} more (use --limit 0 to show all)")
+            print()
     else:
         print("=" * 100)
         print("No disagreements found - all models agree on all evaluations")
         print("=" * 100)
         print()
 
-def generate_comparison_report(results_dir, model_results):
-    output_file = Path(results_dir) / "comparison_summary.json"
-
-    summary = {
-        "models": {},
-        "disagreements": []
-    }
-
-    for model_name, data in model_results.items():
-        metadata = data.get("metadata", {})
-        results = data.get("results", [])
-
-        total = metadata.get("total_evals", len(results))
-        passed = metadata.get("passed", sum(1 for r in results if r.get("passed") is True))
-
-        summary["models"][model_name] = {
-            "total_evals": total,
-            "passed": passed,
-            "failed": metadata.get("failed", total - passed),
-            "pass_rate": metadata.get("pass_rate", round(passed/total*100, 1) if total else 0),
-            "avg_duration_s": metadata.get("avg_duration_s", 0),
-            "total_duration_s": metadata.get("total_duration_s", 0),
-        }
+    return disagreements
 
-    eval_outcomes = defaultdict(dict)
-    for model_name, data in model_results.items():
-        results = data.get("results", [])
-        for result in results:
-            eval_name = result.get("eval") or result.get("test_id")
-            if eval_name:
-                eval_outcomes[eval_name][model_name] = result.get("passed")
+def generate_comparison_report(results_dir, summary, disagreements):
+    output_file = results_dir / "comparison_summary.json"
 
-    for eval_name, outcomes in eval_outcomes.items():
-        if len(set(outcomes.values())) > 1:
-            summary["disagreements"].append({
-                "eval": eval_name,
-                "outcomes": outcomes
-            })
+    report = {
+        "models": summary,
+        "disagreements": [
+            {"eval": eval_name, "outcomes": outcomes}
+            for eval_name, outcomes in disagreements
+        ]
+    }
 
-    output_file.write_text(json.dumps(summary, indent=2))
+    output_file.write_bytes(_dumps(report))
     print(f"Comparison report saved to: {output_file}")
     print()
 
+def _non_negative_int(value):
+    try:
+        limit = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected an integer, got {value!r}") from None
+    if limit < 0:
+        raise argparse.ArgumentTypeError(f"must be >= 0, got {limit}")
+    return limit
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compare batch_results.json files across models.",
+        epilog="Example: python compare_models.py results/",
+    )
+    parser.add_argument("results_dir", help="directory containing per-model batch_results.json files")
+    parser.add_argument(
+        "--limit", "-n",
+        type=_non_negative_int,
+        default=DEFAULT_DISAGREEMENT_LIMIT,
+        help=f"number of disagreements to print (default: {DEFAULT_DISAGREEMENT_LIMIT}, 0 for all)",
+    )
+    return parser.parse_args(argv)
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python compare_models.py <results_directory>")
-        print()
-        print("Example:")
-        print("  python compare_models.py results/")
-        sys.exit(1)
+    args = _parse_args()
+    results_dir, limit = args.results_dir, args.limit
 
-    results_dir = sys.argv[1]
+    results_dir = Path(results_dir)
 
-    if not Path(results_dir).exists():
+    if not results_dir.exists():
         print(f"Error: Directory not found: {results_dir}", file=sys.stderr)
         sys.exit(1)
 
@@ -170,9 +245,11 @@ def main():
     for model_name in sorted(model_results.keys()):
         print(f"  - {model_name}")
 
-    print_summary_table(model_results)
-    analyze_eval_disagreements(model_results)
-    generate_comparison_report(results_dir, model_results)
+    summary, eval_outcomes = _aggregate(model_results)
+
+    print_summary_table(summary)
+    disagreements = analyze_eval_disagreements(eval_outcomes, limit)
+    generate_comparison_report(results_dir, summary, disagreements)
 
 if __name__ == "__main__":
     main()
@@ -1,9 +1,28 @@
 from spatialbench.types import TestCase, TestResult, EvalResult
-from latch_eval_tools.graders import BinaryGrader, GraderResult, GRADER_REGISTRY
-from latch_eval_tools.harness import EvalRunner, run_minisweagent_task
 
 __version__ = "0.1.0"
 
+_lazy_exports = {
+    "BinaryGrader": "latch_eval_tools.graders",
+    "GraderResult": "latch_eval_tools.graders",
+    "GRADER_REGISTRY": "latch_eval_tools.graders",
+    "EvalRunner": "latch_eval_tools.harness",
+    "run_minisweagent_task": "latch_eval_tools.harness",
+}
+
+
+def __getattr__(name):
+    module_name = _lazy_exports.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
 __all__ = [
     "TestCase",
     "TestResult",
@@ -1,44 +1,139 @@
 import click
-import json
+import functools
+import orjson
+import os
 import time
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
-from concurrent.futures import ProcessPoolExecutor, as_completed
-
-from spatialbench import EvalRunner, TestCase
-from latch_eval_tools.harness import run_minisweagent_task, run_claudecode_task, run_openaicodex_task, batch_download_datasets
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
 
 agent_registry = {
-    "minisweagent": ("mini-swe-agent", run_minisweagent_task),
-    "claudecode": ("Claude Code", run_claudecode_task),
-    "openaicodex": ("OpenAI Codex", run_openaicodex_task),
+    "minisweagent": ("mini-swe-agent", "run_minisweagent_task"),
+    "claudecode": ("Claude Code", "run_claudecode_task"),
+    "openaicodex": ("OpenAI Codex", "run_openaicodex_task"),
 }
 
 
-def _run_single_eval(eval_file_path, agent, model, keep_workspace, run_id=None):
-    eval_file = Path(eval_file_path)
+@functools.cache
+def _agent_task(agent):
+    from latch_eval_tools import harness
+
+    return getattr(harness, agent_registry[agent][1])
+
+
+def _isoformat(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+@functools.cache
+def _grader_registry():
+    from latch_eval_tools.graders import GRADER_REGISTRY
+
+    return GRADER_REGISTRY
+
+
+def _iter_json(root, recursive=True):
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        stack.append(entry.path)
+                elif entry.name.endswith(".json") and entry.is_file():
+                    yield entry.path
+
+
+_RESULT_CORE_KEYS = ("eval", "passed", "test_id", "model", "timestamp", "duration_s", "error")
+
+
+class _BatchTally:
+    def __init__(self):
+        self.total = 0
+        self.passed = 0
+        self.failed = 0
+        self.errors = 0
+        self.n_durations = 0
+        self.total_duration = 0
+        self.n_costs = 0
+        self.total_cost = 0
+        self.n_steps = 0
+        self.total_steps = 0
+
+    def add(self, result):
+        self.total += 1
+
+        outcome = result.get("passed")
+        if outcome is True:
+            self.passed += 1
+        elif outcome is False:
+            self.failed += 1
+
+        if "error" in result:
+            self.errors += 1
+
+        if "duration_s" in result:
+            self.n_durations += 1
+            self.total_duration += result["duration_s"]
+
+        cost = result.get("total_cost")
+        if cost is not None:
+            self.n_costs += 1
+            self.total_cost += cost
+
+        steps = result.get("n_steps")
+        if steps is not None:
+            self.n_steps += 1
+            self.total_steps += steps
+
+
+def _load_eval(eval_file):
+    eval_data = orjson.loads(eval_file.read_bytes())
+    if not isinstance(eval_data, dict):
+        raise ValueError("eval file must contain a JSON object")
+    data_node = eval_data.get("data_node")
+    if not (
+        data_node is None
+        or isinstance(data_node, str)
+        or (isinstance(data_node, list) and all(isinstance(uri, str) for uri in data_node))
+    ):
+        raise ValueError("data_node must be a string or a list of strings")
+    return eval_data
+
+
+def _init_worker(agent):
+    _agent_task(agent)
+
+
+def _run_single_eval(eval_file, agent, model, keep_workspace, run_id=None):
+    from spatialbench import EvalRunner
+
     start_time = time.time()
 
     if agent not in agent_registry:
         raise ValueError(f"Unknown agent: {agent}. Available agents: {list(agent_registry.keys())}")
 
-    _, agent_task = agent_registry[agent]
+    agent_task = _agent_task(agent)
     def agent_fn(task_prompt, work_dir):
         return agent_task(task_prompt, work_dir, model_name=model)
 
     try:
         runner = EvalRunner(eval_file, keep_workspace=keep_workspace, run_id=run_id)
         result = runner.run(agent_function=agent_fn)
-        duration = time.time() - start_time
+        end_time = time.time()
 
         output = {
             "eval": eval_file.name,
             "passed": result.get("passed"),
             "test_id": result.get("test_id"),
             "model": model,
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "duration_s": round(duration, 2),
+            "timestamp": _isoformat(end_time),
+            "duration_s": round(end_time - start_time, 2),
         }
 
         if "metadata" in result:
@@ -46,14 +141,14 @@ def _run_single_eval(eval_file_path, agent, model, keep_workspace, run_id=None):
 
         return output
     except Exception as e:
-        duration = time.time() - start_time
+        end_time = time.time()
         return {
             "eval": eval_file.name,
             "passed": False,
             "error": str(e),
             "model": model,
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "duration_s": round(duration, 2),
+            "timestamp": _isoformat(end_time),
+            "duration_s": round(end_time - start_time, 2),
         }
 
 @click.group()
@@ -68,6 +163,8 @@ def main():
 @click.option("--agent", type=click.Choice(list(agent_registry.keys())), default=None, help="Agent to use for evaluation")
 @click.option("--model", default=None, help="Model name for agent")
 def run(eval_path, keep_workspace, verbose, agent, model):
+    from spatialbench import EvalRunner
+
     click.echo(f"Running evaluation: {eval_path}")
 
     runner = EvalRunner(eval_path, keep_workspace=keep_workspace)
@@ -86,7 +183,8 @@ def run(eval_path, keep_workspace, verbose, agent, model):
         result = runner.run()
         return
 
-    agent_name, agent_task = agent_registry[agent]
+    agent_name = agent_registry[agent][0]
+    agent_task = _agent_task(agent)
     click.echo(f"Using {agent_name}{f' with model: {model}' if model else ''}")
 
     def agent_fn(task_prompt, work_dir):
@@ -109,11 +207,10 @@ def run(eval_path, keep_workspace, verbose, agent, model):
 def batch(eval_dir, agent, model, output, parallel, keep_workspace):
     click.echo(f"Running batch evaluations from: {eval_dir}")
 
-    run_id = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    run_id = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
     click.echo(f"Run ID: {run_id}")
 
-    eval_dir = Path(eval_dir)
-    eval_files = list(eval_dir.rglob("*.json"))
+    eval_files = [Path(p) for p in _iter_json(eval_dir)]
 
     click.echo(f"\nFound {len(eval_files)} evaluation(s)")
 
@@ -129,20 +226,38 @@ def batch(eval_dir, agent, model, output, parallel, keep_workspace):
     click.echo("STEP 1: Collecting datasets from all evaluations")
     click.echo("=" * 80)
 
-    all_uris = set()
-    for eval_file in eval_files:
-        try:
-            eval_data = json.loads(eval_file.read_text())
-            test_case = TestCase(**eval_data)
-            if test_case.data_node:
-                if isinstance(test_case.data_node, list):
-                    all_uris.update(test_case.data_node)
-                else:
-                    all_uris.add(test_case.data_node)
-        except Exception as e:
-            click.echo(f"Warning: Failed to parse {eval_file}: {e}")
+    all_uris = {}
+    n_references = 0
+    parsed_evals = []
+    parsed_at = _isoformat(time.time())
+    parse_failures = []
+    with ThreadPoolExecutor(max_workers=min(32, len(eval_files))) as executor:
+        futures = [(eval_file, executor.submit(_load_eval, eval_file)) for eval_file in eval_files]
+
+        for eval_file, future in futures:
+            error = future.exception()
+            if error is not None:
+                click.echo(f"Warning: Failed to parse {eval_file}: {error}")
+                parse_failures.append({
+                    "eval": eval_file.name,
+                    "passed": False,
+                    "error": str(error),
+                    "model": model,
+                    "timestamp": parsed_at,
+                    "duration_s": 0.0,
+                })
+                continue
+
+            parsed_evals.append(eval_file)
+            data_node = future.result().get("data_node")
+            if data_node:
+                uris = data_node if isinstance(data_node, list) else [data_node]
+                n_references += len(uris)
+                all_uris.update(dict.fromkeys(uris))
+
+    click.echo(f"Found {len(all_uris)} unique dataset(s) to download ({n_references} reference(s) across evals)")
 
-    click.echo(f"Found {len(all_uris)} unique dataset(s) to download")
+    from latch_eval_tools.harness import batch_download_datasets
 
     if all_uris:
         click.echo("\n" + "=" * 80)
@@ -154,15 +269,48 @@ def batch(eval_dir, agent, model, output, parallel, keep_workspace):
     click.echo("STEP 3: Running evaluations")
     click.echo("=" * 80)
 
+    eval_files = parsed_evals
+    results = []
+    tally = _BatchTally()
+
+    stream_file = None
+    if output:
+        output_path = Path(output)
+        output_path.mkdir(parents=True, exist_ok=True)
+        stream_file = output_path / "batch_results.ndjson"
+        stream_file.write_bytes(b"")
+        click.echo(f"Streaming results to: {stream_file}")
+
+    def record(result):
+        stream_option = orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        try:
+            line = orjson.dumps(result, option=stream_option)
+        except TypeError:
+            try:
+                line = orjson.dumps(result, default=str, option=stream_option)
+            except TypeError as e:
+                result = {key: result[key] for key in _RESULT_CORE_KEYS if key in result}
+                result["serialization_error"] = str(e)
+                line = orjson.dumps(result, default=str, option=stream_option)
+            result = orjson.loads(line)
+        results.append(result)
+        tally.add(result)
+        if stream_file is not None:
+            with stream_file.open("ab") as f:
+                f.write(line)
+        return result
+
+    for failure in parse_failures:
+        record(failure)
+
     if parallel > 1:
         click.echo(f"Running {len(eval_files)} evaluations with {parallel} parallel workers\n")
 
-        results = []
         completed = 0
 
-        with ProcessPoolExecutor(max_workers=parallel) as executor:
+        with ProcessPoolExecutor(max_workers=parallel, initializer=_init_worker, initargs=(agent,)) as executor:
             future_to_eval = {
-                executor.submit(_run_single_eval, str(eval_file), agent, model, keep_workspace, run_id): eval_file
+                executor.submit(_run_single_eval, eval_file, agent, model, keep_workspace, run_id): eval_file
                 for eval_file in eval_files
             }
 
@@ -172,88 +320,50 @@ def batch(eval_dir, agent, model, output, parallel, keep_workspace):
 
                 try:
                     result = future.result()
-                    results.append(result)
-
-                    status = "✓ PASSED" if result.get("passed") else "✗ FAILED"
-                    click.echo(f"[{completed}/{len(eval_files)}] {eval_file.name}: {status}")
-
                 except Exception as e:
-                    click.echo(f"[{completed}/{len(eval_files)}] {eval_file.name}: ✗ ERROR: {e}")
-                    results.append({
+                    result = {
                         "eval": eval_file.name,
                         "passed": False,
                         "error": str(e),
-                    })
+                    }
+                result = record(result)
+
+                if "error" in result:
+                    status = f"✗ ERROR: {result['error']}"
+                else:
+                    status = "✓ PASSED" if result.get("passed") else "✗ FAILED"
+                click.echo(f"[{completed}/{len(eval_files)}] {eval_file.name}: {status}")
     else:
-        results = []
         for i, eval_file in enumerate(eval_files, 1):
             click.echo(f"\n[{i}/{len(eval_files)}] Running: {eval_file.name}")
             click.echo("-" * 80)
 
-            start_time = time.time()
-
-            try:
-                runner = EvalRunner(eval_file, keep_workspace=keep_workspace, run_id=run_id)
-
-                _, agent_task = agent_registry[agent]
-                def agent_fn(task_prompt, work_dir):
-                    return agent_task(task_prompt, work_dir, model_name=model)
-
-                result = runner.run(agent_function=agent_fn)
-                duration = time.time() - start_time
-
-                eval_output = {
-                    "eval": eval_file.name,
-                    "passed": result.get("passed"),
-                    "test_id": result.get("test_id"),
-                    "model": model,
-                    "timestamp": datetime.utcnow().isoformat() + "Z",
-                    "duration_s": round(duration, 2),
-                }
-
-                if "metadata" in result:
-                    eval_output.update(result["metadata"])
-
-                results.append(eval_output)
+            result = record(_run_single_eval(eval_file, agent, model, keep_workspace, run_id))
 
+            if "error" in result:
+                click.echo(f"✗ ERROR: {result['error']}")
+            else:
                 status = "✓ PASSED" if result.get("passed") else "✗ FAILED"
                 click.echo(f"Result: {status}")
 
-            except Exception as e:
-                duration = time.time() - start_time
-                click.echo(f"✗ ERROR: {e}")
-                results.append({
-                    "eval": eval_file.name,
-                    "passed": False,
-                    "error": str(e),
-                    "model": model,
-                    "timestamp": datetime.utcnow().isoformat() + "Z",
-                    "duration_s": round(duration, 2),
-                })
-
     click.echo("\n" + "=" * 80)
     click.echo("BATCH RESULTS")
     click.echo("=" * 80)
 
-    passed = sum(1 for r in results if r.get("passed") is True)
-    failed = sum(1 for r in results if r.get("passed") is False)
-    errors = sum(1 for r in results if "error" in r)
+    total, passed, failed, errors = tally.total, tally.passed, tally.failed, tally.errors
 
-    durations = [r.get("duration_s", 0) for r in results if "duration_s" in r]
-    avg_duration = sum(durations) / len(durations) if durations else 0
-    total_duration = sum(durations)
+    total_duration = tally.total_duration
+    avg_duration = total_duration / tally.n_durations if tally.n_durations else 0
 
-    costs = [r.get("total_cost", 0) for r in results if r.get("total_cost") is not None]
-    total_cost = sum(costs) if costs else None
-    avg_cost = sum(costs) / len(costs) if costs else None
+    total_cost = tally.total_cost if tally.n_costs else None
+    avg_cost = tally.total_cost / tally.n_costs if tally.n_costs else None
 
-    steps = [r.get("n_steps", 0) for r in results if r.get("n_steps") is not None]
-    total_steps = sum(steps) if steps else None
-    avg_steps = sum(steps) / len(steps) if steps else None
+    total_steps = tally.total_steps if tally.n_steps else None
+    avg_steps = tally.total_steps / tally.n_steps if tally.n_steps else None
 
-    click.echo(f"Total: {len(results)} evaluations")
-    click.echo(f"Passed: {passed} ({passed/len(results)*100:.1f}%)")
-    click.echo(f"Failed: {failed} ({failed/len(results)*100:.1f}%)")
+    click.echo(f"Total: {total} evaluations")
+    click.echo(f"Passed: {passed} ({passed/total*100:.1f}%)")
+    click.echo(f"Failed: {failed} ({failed/total*100:.1f}%)")
     if errors:
         click.echo(f"Errors: {errors}")
     click.echo(f"Average duration: {avg_duration:.1f}s")
@@ -268,18 +378,15 @@ def batch(eval_dir, agent, model, output, parallel, keep_workspace):
         click.echo(f"Model: {model}")
 
     if output:
-        output_path = Path(output)
-        output_path.mkdir(parents=True, exist_ok=True)
-
         metadata = {
             "model": model,
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": _isoformat(time.time()),
             "eval_dir": str(eval_dir),
-            "total_evals": len(results),
+            "total_evals": total,
             "passed": passed,
             "failed": failed,
             "errors": errors,
-            "pass_rate": round(passed/len(results)*100, 1) if results else 0,
+            "pass_rate": round(passed/total*100, 1) if total else 0,
             "avg_duration_s": round(avg_duration, 2),
             "total_duration_s": round(total_duration, 2),
         }
@@ -298,7 +405,7 @@ def batch(eval_dir, agent, model, output, parallel, keep_workspace):
         }
 
         results_file = output_path / "batch_results.json"
-        results_file.write_text(json.dumps(batch_summary, indent=2))
+        results_file.write_bytes(orjson.dumps(batch_summary, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS))
         click.echo(f"\nResults saved to: {results_file}")
 
 @main.command()
@@ -318,7 +425,7 @@ def validate(eval_path):
 
     try:
         eval_path = Path(eval_path)
-        eval_data = json.loads(eval_path.read_text())
+        eval_data = orjson.loads(eval_path.read_bytes())
 
         required_fields = ["id", "task"]
         missing = [f for f in required_fields if f not in eval_data]
@@ -329,11 +436,11 @@ def validate(eval_path):
 
         if "grader" in eval_data:
             grader_type = eval_data["grader"].get("type")
-            from latch_eval_tools.graders import GRADER_REGISTRY
+            grader_registry = _grader_registry()
 
-            if grader_type not in GRADER_REGISTRY:
+            if grader_type not in grader_registry:
                 click.echo(f"❌ Unknown grader type: {grader_type}", err=True)
-                click.echo(f"Available graders: {list(GRADER_REGISTRY.keys())}")
+                click.echo(f"Available graders: {list(grader_registry.keys())}")
                 return
 
         click.echo("✓ Validation passed!")
@@ -342,7 +449,7 @@ def validate(eval_path):
         if "grader" in eval_data:
             click.echo(f"  Grader: {eval_data['grader'].get('type')}")
 
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         click.echo(f"❌ Invalid JSON: {e}", err=True)
     except Exception as e:
         click.echo(f"❌ Validation error: {e}", err=True)
@@ -353,9 +460,6 @@ def list_evals(category):
     click.echo("SpatialBench Evaluations")
     click.echo("=" * 50)
 
-    from pathlib import Path
-    import os
-
     package_dir = Path(__file__).parent.parent
     evals_dir = package_dir / "evals"
 
@@ -373,7 +477,7 @@ def list_evals(category):
         if not cat_dir.exists():
             continue
 
-        eval_files = list(cat_dir.glob("*.json"))
+        eval_files = list(_iter_json(cat_dir, recursive=False))
         if not eval_files:
             continue
 
@@ -382,10 +486,13 @@ def list_evals(category):
 
         for eval_file in sorted(eval_files):
             try:
-                eval_data = json.loads(eval_file.read_text())
-                click.echo(f"  • {eval_data['id']}")
-            except:
-                click.echo(f"  • {eval_file.stem}")
+                with open(eval_file, "rb") as f:
+                    eval_data = orjson.loads(f.read())
+            except (OSError, ValueError):
+                eval_data = None
+
+            eval_id = eval_data.get("id") if isinstance(eval_data, dict) else None
+            click.echo(f"  • {eval_id or os.path.splitext(os.path.basename(eval_file))[0]}")
 
 if __name__ == "__main__":
     main()